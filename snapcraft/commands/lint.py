@@ -17,8 +17,10 @@
 """Snapcraft lint commands."""
 
 import argparse
+import errno
 import os
 import shlex
+import stat
 import subprocess
 import tempfile
 import textwrap
@@ -43,6 +45,11 @@ from snapcraft.utils import (
     is_managed_mode,
 )
 
+# read once at import time rather than for every parser, so later changes to the
+# environment do not affect the defaults
+_DEFAULT_HTTP_PROXY = os.getenv("http_proxy")
+_DEFAULT_HTTPS_PROXY = os.getenv("https_proxy")
+
 
 class LintCommand(AppCommand):
     """Lint-related commands."""
@@ -71,13 +78,13 @@ class LintCommand(AppCommand):
         parser.add_argument(
             "--http-proxy",
             type=str,
-            default=os.getenv("http_proxy"),
+            default=_DEFAULT_HTTP_PROXY,
             help="Set http proxy",
         )
         parser.add_argument(
             "--https-proxy",
             type=str,
-            default=os.getenv("https_proxy"),
+            default=_DEFAULT_HTTPS_PROXY,
             help="Set https proxy",
         )
 
@@ -92,10 +99,18 @@ class LintCommand(AppCommand):
 
         snap_file = parsed_args.snap_file
 
-        if not snap_file.exists():
-            raise ArgumentParsingError(f"snap file {str(snap_file)!r} does not exist")
+        try:
+            snap_file_stat = snap_file.stat()
+        except OSError as error:
+            if error.errno in (errno.ENOENT, errno.ENOTDIR, errno.ELOOP):
+                raise ArgumentParsingError(
+                    f"snap file {str(snap_file)!r} does not exist"
+                ) from error
+            raise ArgumentParsingError(
+                f"snap file {str(snap_file)!r} could not be read: {error.strerror}"
+            ) from error
 
-        if not snap_file.is_file():
+        if not stat.S_ISREG(snap_file_stat.st_mode):
             raise ArgumentParsingError(
                 f"snap file {str(snap_file)!r} is not a valid file"
             )
@@ -213,11 +228,29 @@ class LintCommand(AppCommand):
         # unsquash, load snap.yaml, and optionally load snapcraft.yaml
         with self._unsquash_snap(snap_file) as unsquashed_snap:
             snap_metadata = snap_yaml.read(unsquashed_snap)
-            project = self._load_project(unsquashed_snap / "snap" / "snapcraft.yaml")
+            # check the base before installing anything
+            yaml_data = self._read_project_yaml(
+                unsquashed_snap / "snap" / "snapcraft.yaml"
+            )
+
+            # load the lint config while the snap is being installed
+            install_process = self._install_snap(snap_file, assert_file, snap_metadata)
+            try:
+                lint_config = self._load_lint_config(yaml_data)
+            finally:
+                _, install_error = install_process.communicate()
+
+        if install_process.returncode != 0:
+            emit.debug(f"snap install failed: {install_error.decode().strip()}")
+            raise errors.SnapcraftError(
+                f"could not install snap file {snap_file.name!r}"
+            )
 
-        snap_install_path = self._install_snap(snap_file, assert_file, snap_metadata)
+        snap_install_path = Path("/snap") / snap_metadata.name / "current"
 
-        lint_filters = self._load_lint_filters(project)
+        lint_filters = self._load_lint_filters(
+            lint_config, snapcraft_yaml_found=yaml_data is not None
+        )
 
         # run the linters
         issues = linters.run_linters(location=snap_install_path, lint=lint_filters)
@@ -225,7 +258,9 @@ class LintCommand(AppCommand):
 
     @contextmanager
     def _unsquash_snap(self, snap_file: Path) -> Iterator[Path]:
-        """Unsquash a snap file to a temporary directory.
+        """Unsquash the metadata files of a snap file to a temporary directory.
+
+        Only ``meta/snap.yaml`` and ``snap/snapcraft.yaml`` are extracted.
 
         :param snap_file: Snap package to extract.
 
@@ -235,7 +270,7 @@ class LintCommand(AppCommand):
         """
         snap_file = snap_file.resolve()
 
-        with tempfile.TemporaryDirectory(prefix=str(snap_file.parent)) as temp_dir:
+        with tempfile.TemporaryDirectory(dir=snap_file.parent) as temp_dir:
             emit.progress(f"Unsquashing snap file {snap_file.name!r}.")
 
             # unsquashfs [options] filesystem [directories or files to extract] options:
@@ -247,6 +282,8 @@ class LintCommand(AppCommand):
                 "-dest",
                 temp_dir,
                 str(snap_file),
+                "meta/snap.yaml",
+                "snap/snapcraft.yaml",
             ]
 
             try:
@@ -258,15 +295,16 @@ class LintCommand(AppCommand):
 
             yield Path(temp_dir)
 
-    def _load_project(self, snapcraft_yaml_file: Path) -> models.Project | None:
-        """Load a snapcraft Project from a snapcraft.yaml, if present.
+    def _read_project_yaml(self, snapcraft_yaml_file: Path) -> dict[str, Any] | None:
+        """Read the yaml data from a snapcraft.yaml, if present.
 
         The snapcraft.yaml exist for snaps built with the `--enable-manifest` parameter.
 
-        :param snapcraft_yaml_file: path to snapcraft.yaml file to load
+        :param snapcraft_yaml_file: path to snapcraft.yaml file to read
 
-        :returns: A Project containing the snapcraft.yaml's data or None if the yaml
-        file does not exist.
+        :returns: The snapcraft.yaml's data or None if the yaml file does not exist.
+
+        :raises errors.SnapcraftError: If the project uses a base older than core22.
         """
         if not snapcraft_yaml_file.exists():
             emit.debug(f"Could not find {snapcraft_yaml_file.name!r}.")
@@ -274,28 +312,45 @@ class LintCommand(AppCommand):
 
         try:
             # process_yaml will not parse core, core18, and core20 snaps
-            yaml_data = process_yaml(snapcraft_yaml_file)
+            return process_yaml(snapcraft_yaml_file)
         except (errors.LegacyFallback, errors.MaintenanceBase) as error:
             raise errors.SnapcraftError(
                 "can not lint snap using a base older than core22"
             ) from error
 
+    def _load_lint_config(self, yaml_data: dict[str, Any] | None) -> models.Lint | None:
+        """Load the lint config from a snapcraft.yaml's data, if present.
+
+        The project is not processed if the snapcraft.yaml does not define a lint
+        config.
+
+        :param yaml_data: The snapcraft.yaml's data, if present.
+
+        :returns: The project's lint config or None if there is no data or it does
+        not define a lint config.
+        """
+        if not yaml_data or not yaml_data.get("lint"):
+            return None
+
         # process yaml before unmarshalling the data
         arch = str(DebianArchitecture.from_host())
         yaml_data_for_arch = apply_yaml(yaml_data, arch, arch)
         # discard parse-info - it is not needed
         extract_parse_info(yaml_data_for_arch)
         project = models.Project.unmarshal(yaml_data_for_arch)
-        return project
+        return project.lint
 
     def _install_snap(
         self,
         snap_file: Path,
         assert_file: Path | None,
         snap_metadata: snap_yaml.SnapMetadata,
-    ) -> Path:
+    ) -> subprocess.Popen[bytes]:
         """Install a snap file and optional assertion file.
 
+        The assertion file is installed before returning. The snap is installed in
+        the background and the caller must wait for the returned process.
+
         If the architecture of the snap file does not match the host architecture, then
         `snap install` will exit with a descriptive error.
 
@@ -303,9 +358,7 @@ class LintCommand(AppCommand):
         :param assert_file: Optional assertion file to install.
         :param snap_metadata: SnapMetadata from the snap file.
 
-        :returns: Path to where snap was installed.
-
-        :raises errors.SnapcraftError: If the snap cannot be installed.
+        :returns: The process installing the snap.
         """
         is_dangerous = not bool(assert_file)
 
@@ -335,44 +388,40 @@ class LintCommand(AppCommand):
 
         emit.progress(f"Installing snap with {shlex.join(install_command)!r}.")
 
-        try:
-            subprocess.run(install_command, capture_output=True, check=True)
-        except subprocess.CalledProcessError as error:
-            raise errors.SnapcraftError(
-                f"could not install snap file {snap_file.name!r}"
-            ) from error
-
-        return Path("/snap") / snap_metadata.name / "current"
+        return subprocess.Popen(
+            install_command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
 
-    def _load_lint_filters(self, project: models.Project | None) -> models.Lint:
-        """Load lint filters from a Project and disable the classic linter.
+    def _load_lint_filters(
+        self, lint_config: models.Lint | None, *, snapcraft_yaml_found: bool
+    ) -> models.Lint:
+        """Load lint filters from a lint config and disable the classic linter.
 
-        :param project: Project from the snap file, if present.
+        :param lint_config: Lint config from the snap file's snapcraft.yaml, if present.
+        :param snapcraft_yaml_found: Whether the snap file contains a snapcraft.yaml.
 
         :returns: Lint config with classic linter disabled.
         """
-        lint_config = models.Lint(ignore=["classic"])
-
-        if project:
-            if project.lint:
-                emit.verbose("Collected lint config from 'snapcraft.yaml'.")
-                lint_config = project.lint
-
-                # remove any file-specific classic filters
-                for item in lint_config.ignore:
-                    if isinstance(item, dict) and "classic" in item.keys():
-                        lint_config.ignore.remove(item)
-
-                # disable entire classic linter with the "classic" string
-                if "classic" not in lint_config.ignore:
-                    lint_config.ignore.append("classic")
-
-            else:
-                emit.verbose("No lint filters defined in 'snapcraft.yaml'.")
-        else:
+        if not snapcraft_yaml_found:
             emit.verbose(
                 "Not loading lint filters from 'snapcraft.yaml' because the file "
                 "does not exist inside the snap file."
             )
+            return models.Lint(ignore=["classic"])
+
+        if not lint_config:
+            emit.verbose("No lint filters defined in 'snapcraft.yaml'.")
+            return models.Lint(ignore=["classic"])
+
+        emit.verbose("Collected lint config from 'snapcraft.yaml'.")
+
+        # remove any file-specific classic filters
+        for item in lint_config.ignore:
+            if isinstance(item, dict) and "classic" in item.keys():
+                lint_config.ignore.remove(item)
+
+        # disable entire classic linter with the "classic" string
+        if "classic" not in lint_config.ignore:
+            lint_config.ignore.append("classic")
 
         return lint_config
@@ -18,13 +18,18 @@
 
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import os
 import pathlib
+import stat
 import textwrap
+import threading
 from collections import abc
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from craft_application.commands import AppCommand
-from craft_cli import emit
+from craft_cli import EmitterMode, emit
 from craft_cli.errors import ArgumentParsingError
 from overrides import overrides
 from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
@@ -36,6 +41,11 @@ from snapcraft_legacy._store import get_data_from_snap_file
 if TYPE_CHECKING:
     import argparse
 
+    import craft_store
+
+_MAX_UPLOAD_WORKERS = 4
+"""Maximum number of files to upload to the store at the same time."""
+
 
 class ComponentOption:
     """Argparse helper to validate and convert a 'component' option.
@@ -50,13 +60,14 @@ class ComponentOption:
 
     def __init__(self, value: str) -> None:
         """Run by argparse to validate and convert the given argument."""
-        parts = [p.strip() for p in value.split("=") if p.strip()]
-        if len(parts) == 2:
-            self.name = parts[0]
-            self.path = pathlib.Path(parts[1])
-        else:
+        name, separator, path = value.partition("=")
+        name, path = name.strip(), path.strip()
+        if not (separator and name and path) or "=" in path:
             raise ValueError("the `--component` format must be <name>=<path>")
 
+        self.name = name
+        self.path = pathlib.Path(path)
+
 
 class StoreUploadCommand(AppCommand):
     """Upload a snap to the Snap Store."""
@@ -106,7 +117,13 @@ class StoreUploadCommand(AppCommand):
     @overrides
     def run(self, parsed_args: argparse.Namespace) -> None:
         snap_file = pathlib.Path(parsed_args.snap_file)
-        if not snap_file.exists() or not snap_file.is_file():
+        try:
+            snap_file_stat = snap_file.stat()
+        except OSError as error:
+            raise ArgumentParsingError(
+                f"{str(snap_file)!r} is not a valid file"
+            ) from error
+        if not stat.S_ISREG(snap_file_stat.st_mode):
             raise ArgumentParsingError(f"{str(snap_file)!r} is not a valid file")
 
         channels: list[str] | None = None
@@ -127,25 +144,19 @@ class StoreUploadCommand(AppCommand):
 
         client.verify_upload(snap_name=snap_name)
 
-        snap_upload_id = client.store_client.upload_file(
-            filepath=snap_file, monitor_callback=create_callback
+        snap_upload_id, component_upload_ids = _upload_files(
+            client.store_client,
+            snap_file,
+            snap_file_stat.st_size,
+            {component.name: pathlib.Path(component.path) for component in components},
         )
 
-        component_upload_ids: dict[str, str] = {}
-        for component in components:
-            emit.debug(f"Uploading component {component.name!r}")
-            upload_id = client.store_client.upload_file(
-                filepath=pathlib.Path(component.path),
-                monitor_callback=create_callback,
-            )
-            component_upload_ids[component.name] = upload_id
-
         revision = client.notify_upload(
             snap_name=snap_name,
             upload_id=snap_upload_id,
             built_at=built_at,
             channels=channels,
-            snap_file_size=snap_file.stat().st_size,
+            snap_file_size=snap_file_stat.st_size,
             components=component_upload_ids or None,
         )
 
@@ -191,24 +202,149 @@ def _validate_components(
             "Use `--component <name>=<filename>`."
         )
 
+    # list each directory once rather than checking every component file
+    directory_entries: dict[pathlib.Path, dict[str, os.DirEntry[str]] | None] = {}
     for component in provided_components:
         if not component.path:
             # should not occur after argparse validation
             raise RuntimeError(f"Component {component.name} has no filename.")
 
         component_filepath = pathlib.Path(component.path)
-        if not component_filepath.is_file():
+        directory = component_filepath.parent
+        if directory not in directory_entries:
+            directory_entries[directory] = _list_entries(directory)
+
+        entries = directory_entries[directory]
+        if entries is None:
+            # fall back to checking the file if the directory cannot be listed
+            is_file = component_filepath.is_file()
+        else:
+            # only stat the entries of the component files
+            entry = entries.get(component_filepath.name)
+            is_file = entry is not None and entry.is_file()
+
+        if not is_file:
             raise errors.SnapcraftError(
                 f"File '{component_filepath}' does not exist for component {component.name!r}."
             )
 
 
-def create_callback(encoder: MultipartEncoder):
-    """Create a callback suitable for upload_file."""
-    with emit.progress_bar("Uploading...", encoder.len, delta=False) as progress:
+def _list_entries(directory: pathlib.Path) -> dict[str, os.DirEntry[str]] | None:
+    """List the entries of a directory.
+
+    :param directory: The directory to list.
+
+    :returns: A mapping of names to entries or None if the directory cannot be read.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+    except OSError as error:
+        emit.debug(f"Could not list files in {str(directory)!r}: {error}")
+        return None
+
+
+def _upload_files(
+    store_client: craft_store.BaseClient,
+    snap_file: pathlib.Path,
+    snap_file_size: int,
+    component_files: dict[str, pathlib.Path],
+) -> tuple[str, dict[str, str]]:
+    """Upload a snap file and its component files to the store.
+
+    Uploads are network-bound, so the files are uploaded concurrently, starting
+    with the snap. If an upload fails, the uploads that have not started are
+    cancelled and the error is raised once the uploads in progress have finished.
+
+    :param store_client: The store client to upload with.
+    :param snap_file: The snap file to upload.
+    :param snap_file_size: The size of the snap file.
+    :param component_files: A mapping of component names to component files.
+
+    :returns: A tuple of the snap's upload id and a mapping of component names to
+    upload ids.
+    """
+    with contextlib.ExitStack() as stack:
+        monitor_callback = None
+        # no progress bar is shown in quiet mode, so don't monitor the uploads
+        if emit.get_mode() != EmitterMode.QUIET:
+            total = snap_file_size + sum(
+                path.stat().st_size for path in component_files.values()
+            )
+            progress = stack.enter_context(
+                emit.progress_bar("Uploading...", total, delta=True)
+            )
+            monitor_callback = _UploadProgress(progress, total).create_callback
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(_MAX_UPLOAD_WORKERS, len(component_files) + 1)
+        )
+        try:
+            snap_upload = executor.submit(
+                store_client.upload_file,
+                filepath=snap_file,
+                monitor_callback=monitor_callback,
+            )
+            component_uploads: dict[str, concurrent.futures.Future[str]] = {}
+            for name, path in component_files.items():
+                emit.debug(f"Uploading component {name!r}")
+                component_uploads[name] = executor.submit(
+                    store_client.upload_file,
+                    filepath=path,
+                    monitor_callback=monitor_callback,
+                )
+
+            done, _ = concurrent.futures.wait(
+                [snap_upload, *component_uploads.values()],
+                return_when=concurrent.futures.FIRST_EXCEPTION,
+            )
+            # raise the first failure, if any
+            for upload in done:
+                upload.result()
+        finally:
+            # running uploads cannot be interrupted, so wait for them to finish
+            # before the progress bar is closed
+            executor.shutdown(cancel_futures=True)
+
+    return snap_upload.result(), {
+        name: upload.result() for name, upload in component_uploads.items()
+    }
+
+
+class _UploadProgress:
+    """Report the progress of concurrent uploads on a single progress bar.
+
+    :param progress: The progress bar to advance, in delta mode.
+    :param total: The combined size of the files being uploaded.
+    """
+
+    def __init__(self, progress: Any, total: int) -> None:
+        self._progress = progress
+        self._total = total
+        self._reported = 0
+        self._lock = threading.Lock()
+
+    def _advance(self, amount: int) -> None:
+        """Advance the progress bar from any upload thread."""
+        with self._lock:
+            # the multipart framing around each file is not part of the total
+            amount = min(amount, self._total - self._reported)
+            self._reported += amount
+            self._progress.advance(amount)
+
+    def create_callback(self, encoder: MultipartEncoder):
+        """Create a callback suitable for upload_file."""
+        # update the progress bar every 0.5% of the upload or 1 MiB,
+        # whichever is larger
+        threshold = max(encoder.len // 200, 1024 * 1024)
+        bytes_reported = 0
 
         def progress_callback(monitor: MultipartEncoderMonitor):
-            progress.advance(monitor.bytes_read)
+            nonlocal bytes_reported
+            bytes_read = monitor.bytes_read
+            if bytes_read - bytes_reported >= threshold or bytes_read >= encoder.len:
+                self._advance(bytes_read - bytes_reported)
+                bytes_reported = bytes_read
 
         return progress_callback
 
@@ -36,6 +36,12 @@ from snapcraft.utils import (
     process_version,
 )
 
+try:
+    # the C-based loader is much faster, but isn't available everywhere
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
 
 class SnapcraftMetadata(BaseMetadata):
     """Snapcraft-specific metadata base model."""
@@ -338,7 +344,7 @@ def read(prime_dir: Path) -> SnapMetadata:
     snap_yaml = prime_dir / "meta" / "snap.yaml"
     try:
         with snap_yaml.open(encoding="utf-8") as file:
-            data = yaml.safe_load(file)
+            data = yaml.load(file, Loader=_SafeLoader)  # noqa: S506
     except OSError as error:
         raise errors.SnapcraftError(f"Cannot read snap metadata: {error}") from error
 
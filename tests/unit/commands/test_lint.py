@@ -14,6 +14,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import argparse
+import errno
+import importlib.util
 import shlex
 import sys
 from pathlib import Path
@@ -57,22 +60,6 @@ def fake_snap_metadata():
     return SnapMetadata.unmarshal(data)
 
 
-@pytest.fixture
-def fake_snapcraft_project():
-    data = {
-        "name": "test-name",
-        "base": "core22",
-        "grade": "stable",
-        "confinement": "strict",
-        "description": "test description",
-        "version": "1.0",
-        "summary": "test summary",
-        "parts": {"part1": {"plugin": "nil"}},
-        "architectures": [{"build_on": ["amd64"], "build_for": ["amd64"]}],
-    }
-    return models.Project.unmarshal(data)
-
-
 @pytest.fixture
 def mock_argv(mocker, fake_snap_file):
     """Mock `snapcraft lint` cli for a snap named `test-snap.snap`."""
@@ -208,6 +195,25 @@ def test_lint_http_https_proxy(
     )
 
 
+def test_lint_http_https_proxy_defaults(fake_app_config, monkeypatch):
+    """Default the http and https proxies to the ones from the environment."""
+    monkeypatch.setenv("http_proxy", "test-http-proxy")
+    monkeypatch.setenv("https_proxy", "test-https-proxy")
+
+    # the defaults are read when the module is imported, so load a fresh copy
+    spec = importlib.util.find_spec("snapcraft.commands.lint")
+    assert spec and spec.loader
+    lint_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(lint_module)
+    parser = argparse.ArgumentParser()
+    lint_module.LintCommand(fake_app_config).fill_parser(parser)
+
+    parsed_args = parser.parse_args(["test-snap.snap"])
+
+    assert parsed_args.http_proxy == "test-http-proxy"
+    assert parsed_args.https_proxy == "test-https-proxy"
+
+
 def test_lint_assert_file_missing(
     emitter,
     fake_assert_file,
@@ -306,6 +312,46 @@ def test_lint_default_snap_file_missing(capsys, fake_snap_file, mock_argv):
     assert f"snap file {str(fake_snap_file)!r} does not exist" in err
 
 
+@pytest.mark.parametrize("snap_file_type", ["symlink-loop", "not-a-directory"])
+def test_lint_default_snap_file_unreachable(
+    capsys, fake_snap_file, mocker, snap_file_type
+):
+    """Raise an error if the snap file path cannot be resolved."""
+    if snap_file_type == "symlink-loop":
+        fake_snap_file.symlink_to(fake_snap_file)
+        snap_file = fake_snap_file
+    else:
+        fake_snap_file.touch()
+        snap_file = fake_snap_file / "test-snap.snap"
+    mocker.patch.object(sys, "argv", ["snapcraft", "lint", str(snap_file)])
+
+    application.main()
+
+    out, err = capsys.readouterr()
+    assert not out
+    assert f"snap file {str(snap_file)!r} does not exist" in err
+
+
+def test_lint_default_snap_file_stat_error(capsys, fake_snap_file, mocker, mock_argv):
+    """Raise an error with the reason if the snap file cannot be read."""
+    original_stat = Path.stat
+
+    def _stat(path, **kwargs):
+        if path == fake_snap_file:
+            raise PermissionError(errno.EACCES, "Permission denied")
+        return original_stat(path, **kwargs)
+
+    mocker.patch.object(Path, "stat", autospec=True, side_effect=_stat)
+
+    application.main()
+
+    out, err = capsys.readouterr()
+    assert not out
+    assert (
+        f"snap file {str(fake_snap_file)!r} could not be read: Permission denied" in err
+    )
+
+
 def test_lint_default_snap_file_not_valid(capsys, fake_snap_file, mock_argv):
     """Raise an error if the snap file is not valid."""
     # make the snap filepath a directory
@@ -353,7 +399,6 @@ def test_lint_managed_mode(
     fake_process,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     grade,
     mock_argv,
     mock_is_managed_mode,
@@ -369,7 +414,15 @@ def test_lint_managed_mode(
 
     # register subprocess calls
     fake_process.register_subprocess(
-        ["unsquashfs", "-force", "-dest", fake_process.any(), str(fake_snap_file)]
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
     )
 
     # build snap install command
@@ -388,8 +441,8 @@ def test_lint_managed_mode(
         "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
     )
     mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=fake_snapcraft_project,
+        "snapcraft.commands.lint.LintCommand._read_project_yaml",
+        return_value={"base": "core22"},
     )
 
     application.main()
@@ -418,7 +471,6 @@ def test_lint_managed_mode_without_snapcraft_yaml(
     fake_process,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     mock_argv,
     mock_is_managed_mode,
     mock_report,
@@ -433,7 +485,15 @@ def test_lint_managed_mode_without_snapcraft_yaml(
 
     # register subprocess calls
     fake_process.register_subprocess(
-        ["unsquashfs", "-force", "-dest", fake_process.any(), str(fake_snap_file)]
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
     )
     fake_process.register_subprocess(
         ["snap", "install", str(fake_snap_file), "--dangerous"]
@@ -443,10 +503,6 @@ def test_lint_managed_mode_without_snapcraft_yaml(
     mocker.patch(
         "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
     )
-    mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=None,
-    )
 
     application.main()
 
@@ -462,6 +518,7 @@ def test_lint_managed_mode_without_snapcraft_yaml(
             call("progress", "Running linter.", permanent=True),
             call("debug", f"Assertion file {str(fake_assert_file)!r} does not exist."),
             call("progress", f"Unsquashing snap file {fake_snap_file.name!r}."),
+            call("debug", "Could not find 'snapcraft.yaml'."),
             call(
                 "progress",
                 f"Installing snap with 'snap install {str(fake_snap_file)} "
@@ -482,7 +539,6 @@ def test_lint_managed_mode_unsquash_error(
     fake_process,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     mock_argv,
     mock_is_managed_mode,
     mock_report,
@@ -497,7 +553,15 @@ def test_lint_managed_mode_unsquash_error(
 
     # register subprocess calls
     fake_process.register_subprocess(
-        ["unsquashfs", "-force", "-dest", fake_process.any(), str(fake_snap_file)],
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ],
         returncode=1,
     )
 
@@ -506,8 +570,8 @@ def test_lint_managed_mode_unsquash_error(
         "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
     )
     mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=fake_snapcraft_project,
+        "snapcraft.commands.lint.LintCommand._load_lint_config",
+        return_value=None,
     )
 
     application.main()
@@ -523,7 +587,6 @@ def test_lint_managed_mode_snap_install_error(
     fake_process,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     mock_argv,
     mock_is_managed_mode,
     mock_report,
@@ -538,10 +601,20 @@ def test_lint_managed_mode_snap_install_error(
 
     # register subprocess calls
     fake_process.register_subprocess(
-        ["unsquashfs", "-force", "-dest", fake_process.any(), str(fake_snap_file)]
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
     )
     fake_process.register_subprocess(
-        ["snap", "install", str(fake_snap_file), "--dangerous"], returncode=1
+        ["snap", "install", str(fake_snap_file), "--dangerous"],
+        returncode=1,
+        stderr="error: cannot install snap",
     )
 
     # mock data from the unsquashed snap
@@ -549,8 +622,8 @@ def test_lint_managed_mode_snap_install_error(
         "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
     )
     mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=fake_snapcraft_project,
+        "snapcraft.commands.lint.LintCommand._load_lint_config",
+        return_value=None,
     )
 
     application.main()
@@ -558,6 +631,105 @@ def test_lint_managed_mode_snap_install_error(
     out, err = capsys.readouterr()
     assert not out
     assert f"could not install snap file {fake_snap_file.name!r}" in err
+    emitter.assert_debug("snap install failed: error: cannot install snap")
+
+
+def test_lint_managed_mode_unsupported_base(
+    capsys,
+    fake_process,
+    fake_snap_file,
+    fake_snap_metadata,
+    mock_argv,
+    mock_is_managed_mode,
+    mock_run_linters,
+    mocker,
+):
+    """Do not install the snap if its base is not supported."""
+    mock_is_managed_mode.return_value = True
+
+    # create a snap file
+    fake_snap_file.touch()
+
+    # register subprocess calls
+    fake_process.register_subprocess(
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
+    )
+    install_command = ["snap", "install", str(fake_snap_file), "--dangerous"]
+    fake_process.register_subprocess(install_command)
+
+    # mock data from the unsquashed snap
+    mocker.patch(
+        "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
+    )
+    mocker.patch(
+        "snapcraft.commands.lint.LintCommand._read_project_yaml",
+        side_effect=SnapcraftError("can not lint snap using a base older than core22"),
+    )
+
+    application.main()
+
+    out, err = capsys.readouterr()
+    assert not out
+    assert "can not lint snap using a base older than core22" in err
+    assert fake_process.call_count(install_command) == 0
+    mock_run_linters.assert_not_called()
+
+
+def test_lint_managed_mode_load_lint_config_error(
+    capsys,
+    fake_process,
+    fake_snap_file,
+    fake_snap_metadata,
+    mock_argv,
+    mock_is_managed_mode,
+    mock_run_linters,
+    mocker,
+):
+    """Raise an error if the lint config fails to load while the snap is installing."""
+    mock_is_managed_mode.return_value = True
+
+    # create a snap file
+    fake_snap_file.touch()
+
+    # register subprocess calls
+    fake_process.register_subprocess(
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
+    )
+    install_command = ["snap", "install", str(fake_snap_file), "--dangerous"]
+    fake_process.register_subprocess(install_command)
+
+    # mock data from the unsquashed snap
+    mocker.patch(
+        "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
+    )
+    mocker.patch(
+        "snapcraft.commands.lint.LintCommand._load_lint_config",
+        side_effect=SnapcraftError("test error"),
+    )
+
+    application.main()
+
+    out, err = capsys.readouterr()
+    assert not out
+    assert "test error" in err
+    assert fake_process.call_count(install_command) == 1
+    mock_run_linters.assert_not_called()
 
 
 def test_lint_managed_mode_assert(
@@ -566,7 +738,6 @@ def test_lint_managed_mode_assert(
     fake_process,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     mock_argv,
     mock_is_managed_mode,
     mock_report,
@@ -582,7 +753,15 @@ def test_lint_managed_mode_assert(
 
     # register subprocess calls
     fake_process.register_subprocess(
-        ["unsquashfs", "-force", "-dest", fake_process.any(), str(fake_snap_file)]
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
     )
     fake_process.register_subprocess(["snap", "ack", str(fake_assert_file)])
     fake_process.register_subprocess(["snap", "install", str(fake_snap_file)])
@@ -592,8 +771,8 @@ def test_lint_managed_mode_assert(
         "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
     )
     mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=fake_snapcraft_project,
+        "snapcraft.commands.lint.LintCommand._read_project_yaml",
+        return_value={"base": "core22"},
     )
 
     application.main()
@@ -626,7 +805,6 @@ def test_lint_managed_mode_assert_error(
     fake_process,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     mock_argv,
     mock_is_managed_mode,
     mock_report,
@@ -642,7 +820,15 @@ def test_lint_managed_mode_assert_error(
 
     # register subprocess calls
     fake_process.register_subprocess(
-        ["unsquashfs", "-force", "-dest", fake_process.any(), str(fake_snap_file)]
+        [
+            "unsquashfs",
+            "-force",
+            "-dest",
+            fake_process.any(),
+            str(fake_snap_file),
+            "meta/snap.yaml",
+            "snap/snapcraft.yaml",
+        ]
     )
     fake_process.register_subprocess(
         ["snap", "ack", str(fake_assert_file)], returncode=1
@@ -656,8 +842,8 @@ def test_lint_managed_mode_assert_error(
         "snapcraft.commands.lint.snap_yaml.read", return_value=fake_snap_metadata
     )
     mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=fake_snapcraft_project,
+        "snapcraft.commands.lint.LintCommand._read_project_yaml",
+        return_value={"base": "core22"},
     )
 
     application.main()
@@ -728,7 +914,6 @@ def test_lint_managed_mode_with_lint_config(
     expected_lint,
     fake_snap_file,
     fake_snap_metadata,
-    fake_snapcraft_project,
     mock_argv,
     mock_is_managed_mode,
     mock_report,
@@ -739,6 +924,9 @@ def test_lint_managed_mode_with_lint_config(
     """Run the linter in managed mode and process the lint config from the project."""
     mock_is_managed_mode.return_value = True
     mocker.patch("subprocess.run")
+    mock_popen = mocker.patch("subprocess.Popen")
+    mock_popen.return_value.communicate.return_value = (None, b"")
+    mock_popen.return_value.returncode = 0
 
     # create a snap file
     fake_snap_file.touch()
@@ -749,10 +937,13 @@ def test_lint_managed_mode_with_lint_config(
     )
 
     # add a lint config to the project
-    fake_snapcraft_project.lint = project_lint
     mocker.patch(
-        "snapcraft.commands.lint.LintCommand._load_project",
-        return_value=fake_snapcraft_project,
+        "snapcraft.commands.lint.LintCommand._read_project_yaml",
+        return_value={"base": "core22", "lint": {}},
+    )
+    mocker.patch(
+        "snapcraft.commands.lint.LintCommand._load_lint_config",
+        return_value=project_lint,
     )
 
     application.main()
@@ -778,6 +969,7 @@ def test_lint_managed_mode_with_lint_config(
             "base": "core22",
             "confinement": "strict",
             "grade": "stable",
+            "lint": {"ignore": ["library"]},
             "parts": {
                 "part1": {
                     "plugin": "nil",
@@ -786,26 +978,39 @@ def test_lint_managed_mode_with_lint_config(
         }
     ],
 )
-def test_load_project(
+def test_load_lint_config(
     snapcraft_yaml_data,
     snapcraft_yaml,
-    fake_snapcraft_project,
     tmp_path,
     fake_app_config,
 ):
-    """Load a simple snapcraft.yaml project.
+    """Load the lint config from a simple snapcraft.yaml project.
 
-    To simplify the unit tests, the `_load_project()` method is mocked out of the other
-    tests and tested separately.
+    To simplify the unit tests, the `_load_lint_config()` method is mocked out of the
+    other tests and tested separately.
     """
     filename = "snap/snapcraft.yaml"
     snapcraft_yaml(filename=filename, **snapcraft_yaml_data)
 
-    result = LintCommand(fake_app_config)._load_project(
-        snapcraft_yaml_file=Path(filename)
-    )
+    lint_command = LintCommand(fake_app_config)
+    yaml_data = lint_command._read_project_yaml(snapcraft_yaml_file=Path(filename))
+
+    result = lint_command._load_lint_config(yaml_data=yaml_data)
+
+    assert result == models.Lint(ignore=["library"])
+
+
+def test_load_lint_config_no_lint(snapcraft_yaml, fake_app_config):
+    """Return None if the snapcraft.yaml does not define a lint config."""
+    filename = "snap/snapcraft.yaml"
+    snapcraft_yaml(filename=filename, base="core22")
 
-    assert result == fake_snapcraft_project
+    lint_command = LintCommand(fake_app_config)
+    yaml_data = lint_command._read_project_yaml(snapcraft_yaml_file=Path(filename))
+
+    result = lint_command._load_lint_config(yaml_data=yaml_data)
+
+    assert result is None
 
 
 @pytest.mark.parametrize(
@@ -820,6 +1025,7 @@ def test_load_project(
             "confinement": "strict",
             "grade": "stable",
             "architectures": ["amd64", "arm64", "armhf"],
+            "lint": {"ignore": ["library"]},
             "apps": {
                 "app1": {
                     "command": "app1",
@@ -842,10 +1048,10 @@ def test_load_project(
     ],
 )
 @pytest.mark.usefixtures("fake_extension")
-def test_load_project_complex(
+def test_load_lint_config_complex(
     snapcraft_yaml_data, snapcraft_yaml, mocker, tmp_path, fake_app_config
 ):
-    """Load a complex snapcraft file.
+    """Load the lint config from a complex snapcraft file.
 
     This includes lint, parse-info, architectures, and advanced grammar.
     """
@@ -854,48 +1060,19 @@ def test_load_project_complex(
     # mock for advanced grammar parsing (i.e. `on amd64:`)
     mocker.patch("craft_platforms.DebianArchitecture.from_host", return_value="amd64")
 
-    result = LintCommand(fake_app_config)._load_project(
-        snapcraft_yaml_file=Path(filename)
-    )
-    assert result == models.Project.unmarshal(
-        {
-            "name": "test-name",
-            "base": "core22",
-            "build_base": "core22",
-            "version": "1.0",
-            "summary": "test summary",
-            "description": "test description",
-            "confinement": "strict",
-            "grade": "stable",
-            "architectures": [{"build_on": ["amd64"], "build_for": ["amd64"]}],
-            "apps": {
-                "app1": {
-                    "command": "app1",
-                    "plugs": ["fake-plug"],
-                    "command-chain": ["fake-command"],
-                }
-            },
-            "parts": {
-                "nil": {
-                    "plugin": "nil",
-                    "stage-packages": [
-                        "mesa-opencl-icd",
-                        "ocl-icd-libopencl1",
-                        "intel-opencl-icd",
-                    ],
-                    "after": ["fake-extension/fake-part"],
-                },
-                "fake-extension/fake-part": {"plugin": "nil"},
-            },
-        }
-    )
+    lint_command = LintCommand(fake_app_config)
+    yaml_data = lint_command._read_project_yaml(snapcraft_yaml_file=Path(filename))
+
+    result = lint_command._load_lint_config(yaml_data=yaml_data)
+
+    assert result == models.Lint(ignore=["library"])
 
 
-def test_load_project_no_file(emitter, tmp_path, fake_app_config):
+def test_read_project_yaml_no_file(emitter, tmp_path, fake_app_config):
     """Return None if there is no snapcraft.yaml file."""
     snapcraft_yaml_file = tmp_path / "snap/snapcraft.yaml"
 
-    result = LintCommand(fake_app_config)._load_project(
+    result = LintCommand(fake_app_config)._read_project_yaml(
         snapcraft_yaml_file=snapcraft_yaml_file
     )
 
@@ -904,7 +1081,7 @@ def test_load_project_no_file(emitter, tmp_path, fake_app_config):
 
 
 @pytest.mark.parametrize("base", ["core", "core18", "core20"])
-def test_load_project_unsupported_core_error(base, tmp_path, fake_app_config):
+def test_read_project_yaml_unsupported_core_error(base, tmp_path, fake_app_config):
     """Raise an error if for snaps with core, core18, and core20 bases."""
     # create a simple snapcraft.yaml
     (tmp_path / "snap").mkdir()
@@ -928,6 +1105,6 @@ def test_load_project_unsupported_core_error(base, tmp_path, fake_app_config):
     )
 
     with pytest.raises(SnapcraftError) as raised:
-        LintCommand(fake_app_config)._load_project(snapcraft_yaml_file=snap_file)
+        LintCommand(fake_app_config)._read_project_yaml(snapcraft_yaml_file=snap_file)
 
     assert str(raised.value) == "can not lint snap using a base older than core22"
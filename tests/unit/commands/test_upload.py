@@ -1,12 +1,15 @@
 import argparse
 import pathlib
 import sys
-from unittest.mock import ANY, call
+import threading
+import time
+from unittest.mock import ANY, Mock, call
 
 import craft_cli.errors
 import pytest
 
 from snapcraft import cli, commands
+from snapcraft.commands import upload
 from snapcraft.commands.upload import ComponentOption
 from tests import unit
 
@@ -20,11 +23,12 @@ def fake_store_client_upload_file(mocker):
     fake_client = mocker.patch(
         "craft_store.BaseClient.upload_file",
         autospec=True,
-        # return a different upload_id for each upload
-        side_effect=[
-            "2ecbfac1-3448-4e7d-85a4-7919b999f120",
-            "227a7e65-b29f-4e62-af1c-c1969169d396",
-        ],
+        # return a different upload_id for each file, as uploads are concurrent
+        side_effect=lambda _client, *, filepath, monitor_callback: (
+            "227a7e65-b29f-4e62-af1c-c1969169d396"
+            if filepath.suffix == ".comp"
+            else "2ecbfac1-3448-4e7d-85a4-7919b999f120"
+        ),
     )
     return fake_client
 
@@ -211,6 +215,67 @@ def test_invalid_file(fake_app_config):
     assert str(raised.value) == "'invalid.snap' is not a valid file"
 
 
+def test_invalid_file_directory(fake_app_config, tmp_path):
+    cmd = commands.StoreUploadCommand(fake_app_config)
+
+    with pytest.raises(craft_cli.errors.ArgumentParsingError) as raised:
+        cmd.run(
+            argparse.Namespace(
+                snap_file=str(tmp_path),
+                channels=None,
+                component=[],
+            )
+        )
+
+    assert str(raised.value) == f"{str(tmp_path)!r} is not a valid file"
+
+
+def test_upload_progress():
+    """The upload progress is reported as the bytes read since the last update."""
+    mib = 1024 * 1024
+    progress = Mock()
+    callback = upload._UploadProgress(progress, 4 * mib).create_callback(
+        Mock(len=4 * mib)
+    )
+
+    for bytes_read in (mib // 2, mib, 3 * mib // 2, 4 * mib):
+        callback(Mock(bytes_read=bytes_read))
+
+    assert progress.mock_calls == [call.advance(mib), call.advance(3 * mib)]
+
+
+def test_upload_progress_large_file():
+    """Large uploads are reported every 0.5% of the file."""
+    size = 1000 * 1024 * 1024
+    progress = Mock()
+    callback = upload._UploadProgress(progress, size).create_callback(Mock(len=size))
+
+    for bytes_read in range(0, size + 1, size // 1000):
+        callback(Mock(bytes_read=bytes_read))
+
+    assert progress.mock_calls == [call.advance(size // 200)] * 200
+
+
+def test_upload_progress_multiple_files():
+    """Concurrent uploads advance a single progress bar up to the total size."""
+    mib = 1024 * 1024
+    progress = Mock()
+    upload_progress = upload._UploadProgress(progress, 3 * mib)
+    # the multipart framing makes each upload slightly larger than its file
+    snap_callback = upload_progress.create_callback(Mock(len=2 * mib + 100))
+    component_callback = upload_progress.create_callback(Mock(len=mib + 100))
+
+    snap_callback(Mock(bytes_read=mib))
+    component_callback(Mock(bytes_read=mib + 100))
+    snap_callback(Mock(bytes_read=2 * mib + 100))
+
+    assert progress.mock_calls == [
+        call.advance(mib),
+        call.advance(mib + 100),
+        call.advance(mib - 100),
+    ]
+
+
 ##################################
 # Upload command with components #
 ##################################
@@ -223,6 +288,13 @@ def test_componentoption_convert_ok():
     assert r.path == pathlib.Path("test-snap+test-component_1.0.comp")
 
 
+def test_componentoption_convert_whitespace():
+    """Surrounding whitespace is removed from the name and path."""
+    r = ComponentOption(" test-component = test-snap+test-component_1.0.comp ")
+    assert r.name == "test-component"
+    assert r.path == pathlib.Path("test-snap+test-component_1.0.comp")
+
+
 @pytest.mark.parametrize(
     "value",
     [
@@ -231,6 +303,7 @@ def test_componentoption_convert_ok():
         pytest.param("  =file", id="no name, really!"),
         pytest.param("name=", id="no filename"),
         pytest.param("foo=bar=15", id="invalid name"),
+        pytest.param("foo==bar", id="double separator"),
     ],
 )
 def test_componentoption_convert_error(value):
@@ -297,6 +370,91 @@ def test_component_missing_file(capsys, mocker, snap_file_with_component):
     ) in err
 
 
+def test_component_file_is_directory(
+    capsys, mocker, snap_file_with_component, tmp_path
+):
+    """Raise an error if the component file is a directory."""
+    mocker.patch.object(
+        sys,
+        "argv",
+        [
+            "snapcraft",
+            "upload",
+            snap_file_with_component,
+            "--component",
+            f"test-component={tmp_path}",
+        ],
+    )
+
+    cli.run()
+
+    _, err = capsys.readouterr()
+
+    assert f"File '{tmp_path}' does not exist for component 'test-component'." in err
+
+
+@pytest.mark.usefixtures("memory_keyring")
+def test_component_directory_not_listable(
+    emitter,
+    fake_store_notify_upload,
+    fake_store_verify_upload,
+    snap_file_with_component,
+    component_file,
+    mocker,
+):
+    """Check the component file directly if its directory cannot be listed."""
+    mocker.patch.object(
+        sys,
+        "argv",
+        [
+            "snapcraft",
+            "upload",
+            snap_file_with_component,
+            "--component",
+            f"test-component={component_file}",
+        ],
+    )
+    mocker.patch(
+        "snapcraft.commands.upload.os.scandir",
+        side_effect=PermissionError("Permission denied"),
+    )
+
+    cli.run()
+
+    assert len(fake_store_notify_upload.mock_calls) == 1
+    emitter.assert_message("Revision 10 created for 'test-snap-with-component'")
+
+
+@pytest.mark.usefixtures(
+    "memory_keyring", "fake_store_notify_upload", "fake_store_verify_upload"
+)
+def test_component_directory_only_stats_components(
+    snap_file_with_component, component_file, mocker
+):
+    """Only check the entries of the component files in a directory."""
+    mocker.patch.object(
+        sys,
+        "argv",
+        [
+            "snapcraft",
+            "upload",
+            snap_file_with_component,
+            "--component",
+            f"test-component={component_file}",
+        ],
+    )
+    entries = [Mock(is_file=Mock(return_value=True)) for _ in range(3)]
+    for index, entry in enumerate(entries):
+        entry.name = f"other-{index}"
+    entries[1].name = pathlib.Path(component_file).name
+    mock_scandir = mocker.patch("snapcraft.commands.upload.os.scandir")
+    mock_scandir.return_value.__enter__.return_value = iter(entries)
+
+    cli.run()
+
+    assert [entry.is_file.call_count for entry in entries] == [0, 1, 0]
+
+
 @pytest.mark.usefixtures("memory_keyring")
 def test_components(
     emitter,
@@ -336,3 +494,140 @@ def test_components(
         )
     ]
     emitter.assert_message("Revision 10 created for 'test-snap-with-component'")
+
+
+@pytest.mark.usefixtures(
+    "memory_keyring", "fake_store_notify_upload", "fake_store_verify_upload"
+)
+@pytest.mark.parametrize(
+    "mode", [craft_cli.EmitterMode.BRIEF, craft_cli.EmitterMode.VERBOSE]
+)
+def test_upload_monitor_callback(
+    mode,
+    emitter,
+    fake_store_client_upload_file,
+    snap_file_with_component,
+    component_file,
+    fake_app_config,
+    mocker,
+):
+    """Report the progress of all uploads on a single progress bar."""
+    mocker.patch.object(craft_cli.emit, "get_mode", return_value=mode)
+    cmd = commands.StoreUploadCommand(fake_app_config)
+
+    cmd.run(
+        argparse.Namespace(
+            snap_file=snap_file_with_component,
+            channels=None,
+            component=[ComponentOption(f"test-component={component_file}")],
+        )
+    )
+
+    snap_call, component_call = fake_store_client_upload_file.mock_calls
+    assert snap_call.kwargs["monitor_callback"] is not None
+    assert (
+        snap_call.kwargs["monitor_callback"]
+        == component_call.kwargs["monitor_callback"]
+    )
+    total = (
+        pathlib.Path(snap_file_with_component).stat().st_size
+        + pathlib.Path(component_file).stat().st_size
+    )
+    emitter.assert_interactions(
+        [call("progress_bar", "Uploading...", total, delta=True)]
+    )
+
+
+@pytest.mark.usefixtures("memory_keyring")
+def test_upload_monitor_callback_quiet(
+    emitter,
+    fake_store_client_upload_file,
+    fake_store_notify_upload,
+    fake_store_verify_upload,
+    snap_file,
+    fake_app_config,
+    mocker,
+):
+    """Don't monitor the upload progress when no progress bar can be shown."""
+    mocker.patch.object(
+        craft_cli.emit, "get_mode", return_value=craft_cli.EmitterMode.QUIET
+    )
+    cmd = commands.StoreUploadCommand(fake_app_config)
+
+    cmd.run(
+        argparse.Namespace(
+            snap_file=snap_file,
+            channels=None,
+            component=[],
+        )
+    )
+
+    assert fake_store_client_upload_file.mock_calls == [
+        call(ANY, filepath=pathlib.Path(snap_file), monitor_callback=None)
+    ]
+    assert not [
+        interaction
+        for interaction in emitter.interactions
+        if interaction.args[0] == "progress_bar"
+    ]
+
+
+def test_upload_files_error(tmp_path):
+    """Raise an upload error once the uploads in progress have finished."""
+    snap_file = tmp_path / "test.snap"
+    component_files = {
+        f"component-{i}": tmp_path / f"test+component-{i}.comp" for i in range(5)
+    }
+    for path in (snap_file, *component_files.values()):
+        path.touch()
+
+    snap_failed = threading.Event()
+    uploads_started = []
+    uploads_returned = []
+
+    def fake_upload_file(*, filepath, monitor_callback):
+        if filepath == snap_file:
+            snap_failed.set()
+            raise RuntimeError("upload failed")
+        uploads_started.append(filepath)
+        # keep the component uploads running after the snap upload fails
+        snap_failed.wait(timeout=10)
+        time.sleep(0.1)
+        uploads_returned.append(filepath)
+        return "upload-id"
+
+    store_client = Mock(upload_file=Mock(side_effect=fake_upload_file))
+
+    with pytest.raises(RuntimeError, match="upload failed"):
+        upload._upload_files(store_client, snap_file, 0, component_files)
+
+    assert sorted(uploads_returned) == sorted(uploads_started)
+    assert len(uploads_started) < len(component_files)
+
+
+def test_upload_files_concurrent(tmp_path):
+    """Upload the snap and its components at the same time."""
+    snap_file = tmp_path / "test.snap"
+    component_files = {
+        "component-1": tmp_path / "test+component-1.comp",
+        "component-2": tmp_path / "test+component-2.comp",
+    }
+    for path in (snap_file, *component_files.values()):
+        path.touch()
+
+    # each upload waits until all of them are in progress
+    all_started = threading.Barrier(3, timeout=10)
+
+    def fake_upload_file(*, filepath, monitor_callback):
+        all_started.wait()
+        return f"{filepath.name}-id"
+
+    store_client = Mock(upload_file=Mock(side_effect=fake_upload_file))
+
+    assert upload._upload_files(store_client, snap_file, 0, component_files) == (
+        "test.snap-id",
+        {
+            "component-1": "test+component-1.comp-id",
+            "component-2": "test+component-2.comp-id",
+        },
+    )
@@ -21,7 +21,7 @@ import pydantic
 import pytest
 import yaml
 
-from snapcraft import const, models
+from snapcraft import const, errors, models
 from snapcraft.meta import snap_yaml
 from snapcraft.meta.snap_yaml import ContentPlug, ContentSlot, SnapMetadata
 from snapcraft.models import Project
@@ -1390,3 +1390,20 @@ def test_component_metadata_from_component():
     assert metadata.description == component.description
     assert metadata.type == component.type
     assert metadata.hooks == component.hooks
+
+
+@pytest.mark.parametrize("loader", [yaml.SafeLoader, snap_yaml._SafeLoader])
+def test_read(simple_project, new_dir, mocker, loader):
+    """Read back a snap.yaml with the C-based and the pure-Python loaders."""
+    mocker.patch("snapcraft.meta.snap_yaml._SafeLoader", loader)
+    snap_yaml.write(simple_project(), prime_dir=Path(new_dir), arch="amd64")
+    expected = SnapMetadata.unmarshal(
+        yaml.safe_load(Path("meta/snap.yaml").read_text())
+    )
+
+    assert snap_yaml.read(Path(new_dir)) == expected
+
+
+def test_read_missing_file(new_dir):
+    with pytest.raises(errors.SnapcraftError, match="Cannot read snap metadata"):
+        snap_yaml.read(Path(new_dir))